@@ -7,18 +7,22 @@ blocks, save/load placements, and use guidelines for alignment.
 import json
 import argparse
 import os
-import re
 import csv
 import ast
+import functools
+import zipfile
 import tkinter as tk
+import numpy as np
 import webcolors
-from copy import deepcopy
 from enum import Enum
 from tkinter import filedialog, messagebox, simpledialog
 
-
 import log
 
+# Value stored in grid_state for cells not covered by any block.
+EMPTY = -1
+NO_IGNORED_IDS = np.empty(0, dtype=np.int32)
+
 # --- Enums for better state management ---
 
 class Mode(Enum):
@@ -32,6 +36,9 @@ class Mode(Enum):
     SELECT_WI_BLOCKAGE = "Select w/i blockage (move:w/a/s/d/t) (duplicate:c) (swap:x)"
     SELECT_WO_BLOCKAGE = "Select w/o blockage (move:w/a/s/d/t) (duplicate:c) (swap:x)"
 
+# Modes where a press starts a rubber-band drag instead of acting on a single cell
+DRAG_MODES = frozenset(m.value for m in Mode if "Region" in m.value or "Select" in m.value or "Blockage" in m.value)
+
 class Orientation(Enum):
     """Defines the possible orientations of a block."""
     R0 = "R0"
@@ -40,10 +47,16 @@ class Orientation(Enum):
     R180 = "R180"
     R90 = "R90"
 
+class MoveBlocker(Enum):
+    """Reasons a move is rejected; the values are used in the warning shown to the user."""
+    OUT_OF_BOUNDS = "out of boundaries"
+    OCCUPIED = "position is occupied"
+
 # --- Utility Functions ---
 
+@functools.lru_cache(maxsize=512)
 def darken_color(color_name, darken_factor=0.7):
-    """Darkens a given color by a specified factor."""
+    """Darkens a given color by a specified factor. Results are cached per (color, factor)."""
     try:
         rgb = webcolors.name_to_rgb(color_name)
         r, g, b = [int(c * darken_factor) for c in rgb]
@@ -52,22 +65,129 @@ def darken_color(color_name, darken_factor=0.7):
         log.logger.error(f"Error darkening color {color_name}: {e}")
         return color_name  # Return original color on error
 
+# Status codes returned by footprint_status
+FOOTPRINT_FREE, FOOTPRINT_OUT_OF_BOUNDS, FOOTPRINT_OCCUPIED = 0, 1, 2
+
+def footprint_status(grid, x, y, width, height, ignore_ids):
+    """Returns the FOOTPRINT_* status of a width x height rectangle at (x, y), ignoring the blocks in ignore_ids."""
+    grid_width, grid_height = grid.shape
+    if x < 0 or y < 0 or x + width > grid_width or y + height > grid_height:
+        return FOOTPRINT_OUT_OF_BOUNDS
+    region = grid[x:x + width, y:y + height]
+    taken = region[region != EMPTY]
+    # Most targets are empty, so the id lookup is only paid for cells that hold a block
+    if taken.size and not np.isin(taken, ignore_ids).all():
+        return FOOTPRINT_OCCUPIED
+    return FOOTPRINT_FREE
+
+# MoveBlocker reported for each failing footprint status
+MOVE_BLOCKERS = {FOOTPRINT_OUT_OF_BOUNDS: MoveBlocker.OUT_OF_BOUNDS, FOOTPRINT_OCCUPIED: MoveBlocker.OCCUPIED}
+
+def claim_free_slots(occupied, x1, y1, x2, y2, width, height):
+    """Claims free width x height slots with corners in the region, x-major, marking them in occupied; returns the corners."""
+    grid_width, grid_height = occupied.shape
+    y_start, y_stop = max(y1, 0), min(y2, grid_height - height) + 1
+    corners = []
+    if y_start >= y_stop: return corners
+    for x in range(max(x1, 0), min(x2, grid_width - width) + 1):
+        # Slots in one column only overlap along y: a prefix sum finds the free ones, a greedy pass picks among them
+        band = occupied[x:x + width, y_start:y_stop + height - 1].any(axis=0)
+        prefix = np.concatenate(([0], np.cumsum(band)))
+        ys, next_y = [], y_start
+        for y in (np.flatnonzero(prefix[height:] == prefix[:-height]) + y_start).tolist():
+            if y >= next_y:
+                ys.append(y)
+                next_y = y + height
+        if ys:
+            occupied[x:x + width, (np.array(ys)[:, None] + np.arange(height)).ravel()] = True
+            corners.extend((x, y) for y in ys)
+    return corners
+
+# Side a pin on each unrotated side ends up on, per orientation
+PIN_SIDE_MAP = {
+    'R0':   {'T': 'T', 'B': 'B', 'L': 'L', 'R': 'R'}, 'MX': {'T': 'B', 'B': 'T', 'L': 'L', 'R': 'R'},
+    'MY':   {'T': 'T', 'B': 'B', 'L': 'R', 'R': 'L'}, 'R180': {'T': 'B', 'B': 'T', 'L': 'R', 'R': 'L'},
+    'R90':  {'T': 'L', 'B': 'R', 'L': 'B', 'R': 'T'}
+}
+
+# Line coordinates of each side of a block's border, from its (llx, lly, urx, ury) pixel box
+EDGE_COORDS = {
+    'T': lambda llx, lly, urx, ury: (llx, lly, urx, lly),
+    'B': lambda llx, lly, urx, ury: (llx, ury, urx, ury),
+    'L': lambda llx, lly, urx, ury: (llx, lly, llx, ury),
+    'R': lambda llx, lly, urx, ury: (urx, lly, urx, ury),
+}
+
+# Common cell name prefixes that are dropped from block labels
+LABEL_PREFIXES = ("FCCC_ARRAY_", "CPU_LITE_ARRAY_", "CPU2_ARRAY_", "SRAM_ARRAY_", "ISP_ARRAY_")
+
+@functools.lru_cache(maxsize=None)
+def block_label(cell_name):
+    """Returns the short label drawn on a block."""
+    if cell_name.startswith(LABEL_PREFIXES):
+        prefix = next(p for p in LABEL_PREFIXES if cell_name.startswith(p))
+        return cell_name[len(prefix):]
+    return cell_name.split('_')[0]
+
 def read_args():
     parser = argparse.ArgumentParser(description="Block Placement GUI")
     parser.add_argument('-p', '--project_name', default='mye', help='The name of the project to load.')
     return vars(parser.parse_args())
 
+def read_csv_rows(filename, columns):
+    """Reads the given columns of a CSV file as string tuples; raises KeyError for a missing column."""
+    # The dataframe libraries are optional and imported on first use, as they are slow to load
+    try:
+        import polars as pl
+    except ImportError:
+        pl = None
+    if pl is not None:
+        try:
+            # infer_schema_length=0 keeps every column as a string, like the other readers
+            frame = pl.read_csv(filename, infer_schema_length=0, truncate_ragged_lines=True)
+        except pl.exceptions.PolarsError as e:
+            raise ValueError(str(e)) from e
+        missing = [column for column in columns if column not in frame.columns]
+        if missing:
+            raise KeyError(missing[0])
+        # Blank lines come back as all-null rows; the other readers skip them
+        frame = frame.filter(pl.any_horizontal(pl.all().is_not_null()))
+        return frame.select(columns).fill_null('').rows()
+
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    if pd is not None:
+        # index_col=False stops a trailing comma on data rows from turning the first column into the index
+        frame = pd.read_csv(filename, dtype=str, keep_default_na=False, index_col=False)
+        return list(frame[list(columns)].itertuples(index=False, name=None))
+
+    with open(filename, 'r', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+        indices = [header.index(column) if column in header else None for column in columns]
+        if None in indices:
+            raise KeyError(columns[indices.index(None)])
+        # Short rows are padded with '' like the dataframe readers do
+        return [tuple(row[i] if i < len(row) else '' for i in indices) for row in reader if row]
+
+@functools.lru_cache(maxsize=None)
+def parse_pinside(text):
+    """Parses a pinside literal into a frozenset of sides; a blank field means no pins."""
+    if not text.strip(): return frozenset()
+    try:
+        return frozenset(ast.literal_eval(text))
+    except (SyntaxError, TypeError) as e:
+        raise ValueError(f"invalid pinside {text!r}") from e
+
 def read_block_config(filename):
     shapes, colors, pinsides = {}, {}, {}
     try:
-        with open(filename, 'r') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                name = row['block_name']
-                width, height = int(row['width']), int(row['height'])
-                shapes[name] = [(dx, dy) for dy in range(height) for dx in range(width)]
-                colors[name] = row['color']
-                pinsides[name] = ast.literal_eval(row['pinside'])
+        for name, width, height, color, pinside in read_csv_rows(filename, ('block_name', 'width', 'height', 'color', 'pinside')):
+            shapes[name] = (int(width), int(height))
+            colors[name] = color
+            pinsides[name] = parse_pinside(pinside)
     except FileNotFoundError:
         log.logger.error(f"Block config file not found: {filename}")
         messagebox.showerror("Error", f"Block config file not found: {filename}")
@@ -79,14 +199,12 @@ def read_block_config(filename):
 def read_project_config(filename):
     designs = []
     try:
-        with open(filename, 'r') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                designs.append({
-                    'design_name': row['design_name'],
-                    'grid_width': int(row['grid_width']),
-                    'grid_height': int(row['grid_height']),
-                })
+        for design_name, grid_width, grid_height in read_csv_rows(filename, ('design_name', 'grid_width', 'grid_height')):
+            designs.append({
+                'design_name': design_name,
+                'grid_width': int(grid_width),
+                'grid_height': int(grid_height),
+            })
     except FileNotFoundError:
         log.logger.error(f"Project config file not found: {filename}")
         messagebox.showerror("Error", f"Project config file not found: {filename}")
@@ -109,34 +227,49 @@ class CustomDirectionDialog(simpledialog.Dialog):
 
 class BlockObject:
     """Represents a single block object on the canvas."""
-    def __init__(self, cell_name, x, y, block_shape, orientation):
-        self.data = {'cell_name': cell_name, 'shape_ids': [], 'x': x, 'y': y, 'orientation': orientation}
-        self.block_shape = block_shape
+    __slots__ = (
+        'cell_name', 'shape_ids', 'drawn_geometry', 'drawn_fill', 'x', 'y', 'orientation', 'handle', 'selected',
+        'block_width', 'block_height',
+        'llx_in_canvas', 'lly_in_canvas', 'urx_in_canvas', 'ury_in_canvas',
+    )
+
+    def __init__(self, cell_name, x, y, block_size, orientation):
+        self.cell_name, self.x, self.y, self.orientation = cell_name, x, y, orientation
+        self.shape_ids = []
+        self.drawn_geometry = None  # (cell_name, x, y, orientation, cell_size) the canvas items were created for
+        self.drawn_fill = None  # Fill color currently shown by the shape item
+        self.block_width, self.block_height = block_size
+        self.handle = None  # Assigned by BlockPlacement when the block is added
+        self.selected = False  # Mirrors membership in BlockPlacement.selected_blocks
         self.update_bounding_box()
 
     def update_location(self, x, y):
         """Updates the block's grid coordinates."""
-        self.data['x'], self.data['y'] = x, y
+        self.x, self.y = x, y
         self.update_bounding_box()
 
     def update_orientation(self):
         """Cycles through the available orientations."""
         orientations = [o.value for o in Orientation]
-        current_idx = orientations.index(self.data['orientation'])
-        self.data['orientation'] = orientations[(current_idx + 1) % len(orientations)]
+        current_idx = orientations.index(self.orientation)
+        self.orientation = orientations[(current_idx + 1) % len(orientations)]
         # Note: Shape rotation logic is complex and has been omitted for now.
 
     def update_bounding_box(self):
         """Recalculates the coordinate bounding box of the block."""
-        self.llx_in_canvas = self.data['x']
-        self.lly_in_canvas = self.data['y']
-        if not self.block_shape:
-            self.urx_in_canvas, self.ury_in_canvas = self.llx_in_canvas, self.lly_in_canvas
-            return
-        self.urx_in_canvas = self.llx_in_canvas + max(dx for dx, dy in self.block_shape)
-        self.ury_in_canvas = self.lly_in_canvas + max(dy for dx, dy in self.block_shape)
+        self.llx_in_canvas = self.x
+        self.lly_in_canvas = self.y
+        self.urx_in_canvas = self.llx_in_canvas + self.block_width - 1
+        self.ury_in_canvas = self.lly_in_canvas + self.block_height - 1
 
 class BlockPlacement(tk.Tk):
+    # Single-cell modes and the method handling a press at (grid_x, grid_y)
+    CLICK_ACTIONS = {
+        Mode.PLACE.value: '_place_block_at',
+        Mode.DELETE.value: '_delete_block_at',
+        Mode.CHANGE_ORIENTATION.value: '_change_orientation_at',
+    }
+
     def __init__(self, project_name, design_name, grid_width, grid_height):
         super().__init__()
         self.project_name = project_name
@@ -155,7 +288,6 @@ class BlockPlacement(tk.Tk):
             self.winfo_screenwidth() / (2 * self.grid_width),
             (self.winfo_screenheight() - 100) / self.grid_height
         ) * 100) / 100
-        self.cell_size = self.initial_cell_size
 
         self.result_dir = os.path.join('output', self.project_name)
         if not os.path.exists(self.result_dir):
@@ -164,13 +296,22 @@ class BlockPlacement(tk.Tk):
         csv_path = os.path.join('input', self.project_name, f'{self.project_name}_{self.design_name}.csv')
         log.logger.info(f"Reading design spec from {csv_path}")
         self.shape_definitions, self.shape_colors, self.shape_pinsides = read_block_config(csv_path)
-
-        self.block_objects, self.selected_blocks = {}, {}
-        self.guideline_block_ids, self.guideline_ids = {}, []
+        self._dark_colors = {name: darken_color(color, 0.5) for name, color in self.shape_colors.items()}
+        self._pin_edges = self._build_pin_edges()
+        self._shape_styles = self._build_shape_styles()
+        self._update_cell_size(self.initial_cell_size)
+
+        self.block_objects, self.selected_blocks = {}, set()
+        self._selected_handles = NO_IGNORED_IDS
+        self.guideline_block_ids, self.guideline_ids = set(), []
         self.selected_shape = None
-        self.grid_state = [[None for _ in range(self.grid_height)] for _ in range(self.grid_width)]
+        self._next_handle = 0
+        self.grid_state = np.full((self.grid_width, self.grid_height), EMPTY, dtype=np.int32)
         
         self.drag_rect_id, self.drag_start_pos, self.drag_start_grid = None, None, None
+        self._pending_drag = None  # Latest pointer position not yet applied to the rubber band
+        self._grid_cell_size = None  # Zoom level the grid line items were last drawn at
+        self._draw_scheduled = False  # A canvas repaint is pending in Tk's idle queue
 
     def _init_ui(self):
         """Creates and configures the UI elements."""
@@ -183,8 +324,6 @@ class BlockPlacement(tk.Tk):
         canvas_frame.grid_rowconfigure(0, weight=1)
         canvas_frame.grid_columnconfigure(0, weight=1)
         
-        self.canvas_width = self.grid_width * self.cell_size
-        self.canvas_height = self.grid_height * self.cell_size
         self.grid_canvas = tk.Canvas(canvas_frame, bg='white', scrollregion=(0, 0, self.canvas_width, self.canvas_height))
         self.grid_canvas.grid(row=0, column=0, sticky="nsew")
 
@@ -239,14 +378,12 @@ class BlockPlacement(tk.Tk):
             shape_frame = tk.Frame(frames[i % num_columns])
             shape_frame.pack(pady=5)
             
-            coords = self.shape_definitions[name]
-            max_x = max(x for x, y in coords) if coords else 0
-            max_y = max(y for x, y in coords) if coords else 0
+            width, height = self.shape_definitions[name]
             
             btn_canvas = tk.Canvas(
                 shape_frame, 
-                width=(max_x + 1) * self.initial_cell_size / 2,
-                height=(max_y + 1) * self.initial_cell_size / 2,
+                width=max(width, 1) * self.initial_cell_size / 2,
+                height=max(height, 1) * self.initial_cell_size / 2,
                 bg='white', highlightthickness=1, highlightbackground="black"
             )
             btn_canvas.shape_name = name
@@ -290,32 +427,40 @@ class BlockPlacement(tk.Tk):
             return
 
         mode = self.mode.get()
-        drag_modes = [m.value for m in Mode if "Region" in m.value or "Select" in m.value or "Blockage" in m.value]
-
-        if mode in drag_modes:
+        if mode in DRAG_MODES:
             self.drag_start_pos = (canvas_x, canvas_y)
             self.drag_start_grid = (grid_x, grid_y)
-        elif mode == Mode.PLACE.value:
-            self._place_block_at(grid_x, grid_y)
-        elif mode == Mode.DELETE.value:
-            self._delete_block_at(grid_x, grid_y)
-        elif mode == Mode.CHANGE_ORIENTATION.value:
-            self._change_orientation_at(grid_x, grid_y)
+            self._ensure_drag_rect()
+        elif mode in self.CLICK_ACTIONS:
+            getattr(self, self.CLICK_ACTIONS[mode])(grid_x, grid_y)
 
     def on_canvas_drag(self, event):
         """Handles mouse dragging for drawing a selection rectangle."""
         if self.drag_start_pos is None: return
-        if self.drag_rect_id: self.grid_canvas.delete(self.drag_rect_id)
-        
-        self.drag_rect_id = self.grid_canvas.create_rectangle(
-            self.drag_start_pos[0], self.drag_start_pos[1], 
-            self.grid_canvas.canvasx(event.x), self.grid_canvas.canvasy(event.y),
-            outline='blue', dash=(4, 2)
-        )
+        # Motion events are coalesced: only the latest position is drawn once Tk is idle
+        if self._pending_drag is None:
+            self.after_idle(self._flush_drag)
+        self._pending_drag = (self.grid_canvas.canvasx(event.x), self.grid_canvas.canvasy(event.y))
+
+    def _flush_drag(self):
+        """Moves the rubber band to the most recent drag position."""
+        pos, self._pending_drag = self._pending_drag, None
+        if pos is None or self.drag_start_pos is None: return
+        self._ensure_drag_rect()
+        self.grid_canvas.coords(self.drag_rect_id, *self.drag_start_pos, *pos)
+        self.grid_canvas.itemconfig(self.drag_rect_id, state='normal')
+
+    def _ensure_drag_rect(self):
+        """Creates the hidden rubber-band rectangle once; dragging only repositions it."""
+        if self.drag_rect_id is None:
+            self.drag_rect_id = self.grid_canvas.create_rectangle(0, 0, 0, 0, outline='blue', dash=(4, 2), state='hidden')
+        else:
+            self.grid_canvas.tag_raise(self.drag_rect_id)  # Blocks redrawn since the last drag are stacked above it
 
     def on_canvas_release(self, event):
         """Handles the end of a mouse action, completing a drag operation."""
-        if self.drag_rect_id: self.grid_canvas.delete(self.drag_rect_id)
+        self._pending_drag = None
+        if self.drag_rect_id: self.grid_canvas.itemconfig(self.drag_rect_id, state='hidden')
         if self.drag_start_pos is None: return
 
         x_start, y_start = self.drag_start_grid
@@ -334,7 +479,7 @@ class BlockPlacement(tk.Tk):
         action = mode_actions.get(self.mode.get())
         if action: action()
 
-        self.drag_start_pos = self.drag_rect_id = self.drag_start_grid = None
+        self.drag_start_pos = self.drag_start_grid = None
         self.draw()
 
     # --- Action Methods ---
@@ -342,186 +487,260 @@ class BlockPlacement(tk.Tk):
         if not self.selected_shape: return
         if not self._is_location_legal(x, y, self.selected_shape, show_warning=True): return
         
-        block = BlockObject(self.selected_shape, x, y, self.shape_definitions[self.selected_shape], 'R0')
-        self.block_objects[id(block)] = block
-        self.draw()
+        handle = self._add_block(BlockObject(self.selected_shape, x, y, self.shape_definitions[self.selected_shape], 'R0'))
+        self._redraw_block(self.block_objects[handle])
 
     def _delete_block_at(self, x, y):
-        block_id = self.grid_state[x][y]
-        if block_id is None:
+        block_id = int(self.grid_state[x, y])
+        if block_id == EMPTY:
             messagebox.showwarning("Invalid Deletion", "No object at the specified location.")
             return
+        had_guideline = block_id in self.guideline_block_ids
+        # Removal already deletes the block's items; overlapped blocks must be restamped into the cleared cells
         self._remove_block_by_id(block_id)
-        self.draw()
+        self._stamp_blocks()
+        if had_guideline: self._draw_guidelines()
 
     def _change_orientation_at(self, x, y):
-        block_id = self.grid_state[x][y]
-        if block_id is None:
+        block_id = int(self.grid_state[x, y])
+        if block_id == EMPTY:
             messagebox.showwarning("Invalid Operation", "No object at the specified location.")
             return
         
         block = self.block_objects[block_id]
         block.update_orientation()
-        # Redrawing will handle visual update. Legality checks for rotation are complex
+        # Only this block's items change. Legality checks for rotation are complex
         # and were not fully implemented in the original code.
-        self.draw()
+        self._redraw_block(block)
 
     def _place_blockage_in_region(self, x1, y1, x2, y2):
-        for x in range(x1, x2 + 1):
-            for y in range(y1, y2 + 1):
-                if self._is_location_legal(x, y, 'Blockage', show_warning=False):
-                    block = BlockObject('Blockage', x, y, self.shape_definitions['Blockage'], 'R0')
-                    self.block_objects[id(block)] = block
+        block_size = self.shape_definitions['Blockage']
+        occupied = self.grid_state != EMPTY
+        for x, y in claim_free_slots(occupied, x1, y1, x2, y2, *block_size):
+            self._add_block(BlockObject('Blockage', x, y, block_size, 'R0'))
+
+    def _block_ids_in_region(self, x1, y1, x2, y2):
+        """Returns the handles of all blocks covering at least one cell of the region."""
+        # Slicing clamps the region to the grid, so no per-cell bounds checks are needed
+        ids = np.unique(self.grid_state[max(x1, 0):x2 + 1, max(y1, 0):y2 + 1])
+        return ids[ids != EMPTY].tolist()
 
     def _delete_blocks_in_region(self, x1, y1, x2, y2, all_types):
-        ids_to_delete = set()
-        for x in range(x1, x2 + 1):
-            for y in range(y1, y2 + 1):
-                if not (0 <= x < self.grid_width and 0 <= y < self.grid_height): continue
-                block_id = self.grid_state[x][y]
-                if block_id and (all_types or self.block_objects[block_id].data['cell_name'] == 'Blockage'):
-                    ids_to_delete.add(block_id)
+        ids_to_delete = self._block_ids_in_region(x1, y1, x2, y2)
+        if not all_types:
+            ids_to_delete = [block_id for block_id in ids_to_delete if self.block_objects[block_id].cell_name == 'Blockage']
         for block_id in ids_to_delete:
             self._remove_block_by_id(block_id)
 
     def _select_blocks_in_region(self, x1, y1, x2, y2, with_blockage):
+        for block in self.selected_blocks:
+            block.selected = False
         self.selected_blocks.clear()
-        for x in range(x1, x2 + 1):
-            for y in range(y1, y2 + 1):
-                if not (0 <= x < self.grid_width and 0 <= y < self.grid_height): continue
-                block_id = self.grid_state[x][y]
-                if block_id:
-                    block = self.block_objects[block_id]
-                    if with_blockage or block.data['cell_name'] != 'Blockage':
-                        self.selected_blocks[block] = True
+        for block_id in self._block_ids_in_region(x1, y1, x2, y2):
+            block = self.block_objects[block_id]
+            if with_blockage or block.cell_name != 'Blockage':
+                block.selected = True
+                self.selected_blocks.add(block)
+        self._refresh_selected_handles()
         log.logger.info(f"Selected {len(self.selected_blocks)} blocks.")
 
+    def _add_block(self, block):
+        """Registers a block under a new integer handle, marks its cells in grid_state and returns the handle."""
+        block.handle = self._next_handle
+        self._next_handle += 1
+        self.block_objects[block.handle] = block
+        self._stamp_block(block)
+        return block.handle
+
     def _remove_block_by_id(self, block_id):
-        if block_id in self.block_objects:
-            del self.block_objects[block_id]
-        if block_id in self.guideline_block_ids:
-            del self.guideline_block_ids[block_id]
-        if block_id in self.selected_blocks:
-            del self.selected_blocks[block_id]
+        block = self.block_objects.pop(block_id, None)
+        if block is not None:
+            self._erase_block(block)
+            # Overlapping blocks may own some of these cells, so only this block's handle is cleared
+            footprint = self._footprint(block)
+            footprint[footprint == block_id] = EMPTY
+        self.guideline_block_ids.discard(block_id)
+        if block is not None and block.selected:
+            block.selected = False
+            self.selected_blocks.remove(block)
+            self._refresh_selected_handles()
+
+    def _refresh_selected_handles(self):
+        """Caches the selected blocks' handles as an array for the move checks."""
+        self._selected_handles = np.fromiter(
+            (block.handle for block in self.selected_blocks), dtype=np.int32, count=len(self.selected_blocks)
+        )
 
     # --- Drawing ---
     def draw(self):
-        """Redraws the entire canvas, including grid and all blocks."""
-        self.grid_canvas.delete("all")
+        """Restamps grid_state now and schedules a single canvas repaint for when Tk is idle."""
+        self._stamp_blocks()
+        if self._draw_scheduled: return
+        self._draw_scheduled = True
+        self.after_idle(self._draw_now)
+
+    def _draw_now(self):
+        """Redraws the canvas; items of blocks that have not moved or rotated are reused."""
+        self._draw_scheduled = False
         self._draw_grid()
         
-        self.grid_state = [[None for _ in range(self.grid_height)] for _ in range(self.grid_width)]
-        
         # Draw non-blockage items first, then blockages to ensure text visibility
-        sorted_blocks = sorted(self.block_objects.values(), key=lambda b: b.data['cell_name'] == 'Blockage')
-        for block in sorted_blocks:
+        for block in self._blocks_in_draw_order():
             self._draw_block(block)
         self._draw_guidelines()
 
+    def _blocks_in_draw_order(self):
+        """Returns all blocks with blockages last."""
+        blocks, blockages = [], []
+        for block in self.block_objects.values():
+            (blockages if block.cell_name == 'Blockage' else blocks).append(block)
+        blocks.extend(blockages)
+        return blocks
+
+    def _redraw_block(self, block):
+        """Repaints a single block after an edit that affects no other block."""
+        # A pending full repaint will draw it anyway, above any grid lines rebuilt after a zoom
+        if self._draw_scheduled: return
+        self._draw_block(block)
+        # Keep guidelines above the block's new items
+        if self.guideline_ids: self.grid_canvas.tag_raise('guideline')
+
+    def _stamp_blocks(self):
+        """Rebuilds grid_state from the current block positions."""
+        self.grid_state.fill(EMPTY)
+        # Blockages are stamped last, matching the draw order
+        for block in self._blocks_in_draw_order():
+            self._stamp_block(block)
+
+    def _stamp_block(self, block):
+        """Marks a block's cells in grid_state with its handle."""
+        self._footprint(block)[...] = block.handle
+
+    def _footprint(self, block):
+        """Returns the view of grid_state under a block, clipped to the grid."""
+        # Bounds are clamped at 0 because a negative stop would wrap around; blocks can lie
+        # partly outside the grid when they come from an edited placement file
+        x, y = block.x, block.y
+        return self.grid_state[max(x, 0):max(x + block.block_width, 0), max(y, 0):max(y + block.block_height, 0)]
+
     def _draw_grid(self):
-        """Draws the grid lines on the canvas."""
+        """Draws the grid lines on the canvas; the items are kept until the zoom level changes."""
+        if self._grid_cell_size == self.cell_size: return
+        self.grid_canvas.delete("grid")
+        self._grid_cell_size = self.cell_size
+
         # Thin lines for every cell
-        for i in range(self.grid_width + 1):
-            self.grid_canvas.create_line(i * self.cell_size, 0, i * self.cell_size, self.canvas_height, fill='lightgray', width=0.1)
-        for j in range(self.grid_height + 1):
-            self.grid_canvas.create_line(0, j * self.cell_size, self.canvas_width, j * self.cell_size, fill='lightgray', width=0.1)
+        self._draw_line_family(range(self.grid_width + 1), range(self.grid_height + 1), 'lightgray')
         
         # Thicker lines for intervals
         interval = 10 if self.cell_size > 5 else 20
         color = "red" if self.cell_size > 5 else "gray"
-        for i in range(0, self.grid_width, interval):
-            self.grid_canvas.create_line(i*self.cell_size, 0, i*self.cell_size, self.canvas_height, fill=color, width=0.1)
-        for j in range(0, self.grid_height, interval):
-            self.grid_canvas.create_line(0, j*self.cell_size, self.canvas_width, j*self.cell_size, fill=color, width=0.1)
+        self._draw_line_family(range(0, self.grid_width, interval), range(0, self.grid_height, interval), color)
+
+    def _draw_line_family(self, columns, rows, color):
+        """Draws lines at the given columns and rows as one polyline per axis, joined along the top/left edge."""
+        vertical, horizontal = [], []
+        for i in columns:
+            x = i * self.cell_size
+            vertical.extend((x, 0, x, self.canvas_height, x, 0))
+        for j in rows:
+            y = j * self.cell_size
+            horizontal.extend((0, y, self.canvas_width, y, 0, y))
+        self.grid_canvas.create_line(*vertical, fill=color, width=0.1, tags='grid')
+        self.grid_canvas.create_line(*horizontal, fill=color, width=0.1, tags='grid')
 
     def _draw_block(self, block):
         """Draws a single block, its text, and pin indicators."""
-        color = self.shape_colors.get(block.data['cell_name'], 'gray')
-        if block in self.selected_blocks:
-            color = darken_color(color, 0.5)
-
-        llx, lly = block.llx_in_canvas * self.cell_size, block.lly_in_canvas * self.cell_size
-        urx, ury = (block.urx_in_canvas + 1) * self.cell_size, (block.ury_in_canvas + 1) * self.cell_size
-        
-        if block.data['cell_name'] == "TSV":
-            shape_id = self.grid_canvas.create_oval(llx, lly, urx, ury, fill=color, outline='')
-        else:
-            shape_id = self.grid_canvas.create_rectangle(llx, lly, urx, ury, fill=color, outline='')
-        block.data['shape_ids'] = [shape_id]
-
-        for dx, dy in block.block_shape:
-            grid_x, grid_y = block.data['x'] + dx, block.data['y'] + dy
-            if 0 <= grid_x < self.grid_width and 0 <= grid_y < self.grid_height:
-                self.grid_state[grid_x][grid_y] = id(block)
-        
-        self._draw_block_text(block, (llx + urx) / 2, (lly + ury) / 2)
-        self._draw_block_pins(block, llx, lly, urx, ury)
-
-    def _draw_block_text(self, block, center_x, center_y):
-        """Draws the name and orientation text on a block."""
-        name = block.data['cell_name']
-        if name in ['Blockage', 'GPIO']: return
-
-        # Shorten common prefixes
-        for prefix in ["FCCC_ARRAY_", "CPU_LITE_ARRAY_", "CPU2_ARRAY_", "SRAM_ARRAY_", "ISP_ARRAY_"]:
-            if name.startswith(prefix):
-                name = name[len(prefix):]
-                break
-        else:
-            name = name.split('_')[0]
-
-        block.data['shape_ids'].append(self.grid_canvas.create_text(center_x, center_y - 10, text=name, font=("Arial", 8)))
-        block.data['shape_ids'].append(self.grid_canvas.create_text(center_x, center_y + 10, text=block.data['orientation'], font=("Arial", 8)))
+        cell_name, cell_size, canvas = block.cell_name, self.cell_size, self.grid_canvas
+        palette = self._dark_colors if block.selected else self.shape_colors
+        color = palette.get(cell_name, 'gray')
+
+        geometry = (cell_name, block.x, block.y, block.orientation, cell_size)
+        drawn = block.drawn_geometry
+        if block.shape_ids and drawn[0] == cell_name and drawn[3:] == geometry[3:]:
+            # Same shape, orientation and zoom: the existing items are shifted and recolored as needed
+            if drawn != geometry:
+                canvas.move(self._block_tag(block), (block.x - drawn[1]) * cell_size, (block.y - drawn[2]) * cell_size)
+                block.drawn_geometry = geometry
+            if block.drawn_fill != color:
+                canvas.itemconfigure(block.shape_ids[0], fill=color)
+                block.drawn_fill = color
+            return
+        self._erase_block(block)
+        block.drawn_geometry, block.drawn_fill = geometry, color
 
-    def _draw_block_pins(self, block, llx, lly, urx, ury):
-        """Draws lines on the block's border to indicate pin sides."""
-        pin_sides = self.shape_pinsides.get(block.data['cell_name'], "")
-        orientation = block.data['orientation']
-        width = 3
+        llx, lly = block.llx_in_canvas * cell_size, block.lly_in_canvas * cell_size
+        pixel_width, pixel_height = self.scaled_shape_sizes[cell_name]
+        urx, ury = llx + pixel_width, lly + pixel_height
         
-        pin_map = {
-            'R0':   {'T': 'T', 'B': 'B', 'L': 'L', 'R': 'R'}, 'MX': {'T': 'B', 'B': 'T', 'L': 'L', 'R': 'R'},
-            'MY':   {'T': 'T', 'B': 'B', 'L': 'R', 'R': 'L'}, 'R180': {'T': 'B', 'B': 'T', 'L': 'R', 'R': 'L'},
-            'R90':  {'T': 'L', 'B': 'R', 'L': 'B', 'R': 'T'}
+        is_oval, label = self._shape_styles[cell_name]
+        tag = self._block_tag(block)
+        create_shape = canvas.create_oval if is_oval else canvas.create_rectangle
+        shape_ids = [create_shape(llx, lly, urx, ury, fill=color, outline='', tags=tag)]
+
+        # Name and orientation text
+        if label is not None:
+            center_x, center_y = (llx + urx) / 2, (lly + ury) / 2
+            shape_ids.append(canvas.create_text(center_x, center_y - 10, text=label, font=("Arial", 8), tags=tag))
+            shape_ids.append(canvas.create_text(center_x, center_y + 10, text=block.orientation, font=("Arial", 8), tags=tag))
+
+        # Lines on the block's border indicate pin sides
+        for edge_coords in self._pin_edges.get((cell_name, block.orientation), ()):
+            shape_ids.append(canvas.create_line(*edge_coords(llx, lly, urx, ury), width=3, tags=tag))
+        block.shape_ids = shape_ids
+
+    @staticmethod
+    def _block_tag(block):
+        """Returns the canvas tag shared by all items of a block."""
+        return f"blk{block.handle}"
+
+    def _erase_block(self, block):
+        """Deletes a block's canvas items."""
+        if block.shape_ids: self.grid_canvas.delete(self._block_tag(block))
+        block.shape_ids = []
+
+    def _build_shape_styles(self):
+        """Precomputes, per shape, whether it is drawn as an oval and its label (None for unlabeled shapes)."""
+        return {
+            name: (name == "TSV", None if name in ('Blockage', 'GPIO') else block_label(name))
+            for name in self.shape_definitions
         }
-        
-        if orientation not in pin_map: return
 
-        for side in pin_sides:
-            oriented_side = pin_map[orientation].get(side)
-            if oriented_side == 'T': line_id = self.grid_canvas.create_line(llx, lly, urx, lly, width=width)
-            elif oriented_side == 'B': line_id = self.grid_canvas.create_line(llx, ury, urx, ury, width=width)
-            elif oriented_side == 'L': line_id = self.grid_canvas.create_line(llx, lly, llx, ury, width=width)
-            elif oriented_side == 'R': line_id = self.grid_canvas.create_line(urx, lly, urx, ury, width=width)
-            else: continue
-            block.data['shape_ids'].append(line_id)
+    def _build_pin_edges(self):
+        """Precomputes the edge coordinate functions of the oriented pin sides for every (shape, orientation) pair."""
+        return {
+            (name, orientation): tuple(EDGE_COORDS[side_map[side]] for side in pin_sides if side in side_map)
+            for name, pin_sides in self.shape_pinsides.items()
+            for orientation, side_map in PIN_SIDE_MAP.items()
+        }
 
     def _draw_guidelines(self):
         """Draws alignment guidelines for selected blocks."""
-        for line_id in self.guideline_ids: self.grid_canvas.delete(line_id)
+        if self.guideline_ids: self.grid_canvas.delete('guideline')
         self.guideline_ids.clear()
         
         for block_id in self.guideline_block_ids:
             if block_id not in self.block_objects: continue
             block = self.block_objects[block_id]
             llx, lly = block.llx_in_canvas * self.cell_size, block.lly_in_canvas * self.cell_size
-            urx, ury = (block.urx_in_canvas + 1) * self.cell_size, (block.ury_in_canvas + 1) * self.cell_size
+            pixel_width, pixel_height = self.scaled_shape_sizes[block.cell_name]
+            urx, ury = llx + pixel_width, lly + pixel_height
+            w, h = self.canvas_width, self.canvas_height
             
-            self.guideline_ids.append(self.grid_canvas.create_line(llx, 0, llx, self.canvas_height, fill="purple", width=2))
-            self.guideline_ids.append(self.grid_canvas.create_line(urx, 0, urx, self.canvas_height, fill="purple", width=2))
-            self.guideline_ids.append(self.grid_canvas.create_line(0, lly, self.canvas_width, lly, fill="purple", width=2))
-            self.guideline_ids.append(self.grid_canvas.create_line(0, ury, self.canvas_width, ury, fill="purple", width=2))
+            # All four edge lines as one polyline; every connecting segment retraces one of them
+            self.guideline_ids.append(self.grid_canvas.create_line(
+                llx, 0, llx, h, llx, lly, 0, lly, w, lly,
+                urx, lly, urx, 0, urx, h, urx, ury, 0, ury, w, ury,
+                fill="purple", width=2, tags='guideline'
+            ))
 
     def _draw_shape_preview(self, canvas, shape_name):
         """Draws a miniature preview of a shape on its selection button."""
         color = self.shape_colors.get(shape_name, 'gray')
         preview_cell_size = self.initial_cell_size / 2
-        for x, y in self.shape_definitions.get(shape_name, []):
-            canvas.create_rectangle(
-                x * preview_cell_size, y * preview_cell_size,
-                (x + 1) * preview_cell_size, (y + 1) * preview_cell_size,
-                fill=color, outline=''
-            )
+        width, height = self.shape_definitions.get(shape_name, (0, 0))
+        if not width or not height: return
+        canvas.create_rectangle(0, 0, width * preview_cell_size, height * preview_cell_size, fill=color, outline='')
 
     # --- Helpers & Callbacks ---
     def update_mode_label(self):
@@ -535,80 +754,92 @@ class BlockPlacement(tk.Tk):
         """Zooms the canvas in or out by a given factor."""
         new_size = self.cell_size * factor
         if new_size < 1: return # Prevent zooming out too far
-        self.cell_size = new_size
-        self.canvas_width = self.grid_width * self.cell_size
-        self.canvas_height = self.grid_height * self.cell_size
+        self._update_cell_size(new_size)
         self.grid_canvas.config(scrollregion=(0, 0, self.canvas_width, self.canvas_height))
         self.draw()
 
     def fit_fp(self, event=None):
         """Resets the zoom to fit the entire floorplan."""
-        self.cell_size = self.initial_cell_size
-        self.canvas_width = self.grid_width * self.cell_size
-        self.canvas_height = self.grid_height * self.cell_size
+        self._update_cell_size(self.initial_cell_size)
         self.grid_canvas.config(scrollregion=(0, 0, self.canvas_width, self.canvas_height))
         self.draw()
 
+    def _update_cell_size(self, cell_size):
+        """Sets the zoom level and rescales the canvas and per-shape pixel sizes."""
+        self.cell_size = cell_size
+        self.canvas_width = self.grid_width * cell_size
+        self.canvas_height = self.grid_height * cell_size
+        self.scaled_shape_sizes = {
+            name: (width * cell_size, height * cell_size) for name, (width, height) in self.shape_definitions.items()
+        }
+
     def toggle_guideline(self, event):
         """Toggles guidelines for the block under the cursor."""
         x, y = int(self.grid_canvas.canvasx(event.x) / self.cell_size), int(self.grid_canvas.canvasy(event.y) / self.cell_size)
         if not (0 <= x < self.grid_width and 0 <= y < self.grid_height): return
-        block_id = self.grid_state[x][y]
-        if block_id is None: return
+        block_id = int(self.grid_state[x, y])
+        if block_id == EMPTY: return
         
         if block_id in self.guideline_block_ids:
-            del self.guideline_block_ids[block_id]
+            self.guideline_block_ids.remove(block_id)
         else:
-            self.guideline_block_ids[block_id] = True
-        self.draw()
+            self.guideline_block_ids.add(block_id)
+        self._draw_guidelines()
 
     def _is_location_legal(self, x, y, shape_name, show_warning=False, ignore_block_id=None):
         """Checks if a shape can be placed at a given location."""
-        for dx, dy in self.shape_definitions.get(shape_name, []):
-            gx, gy = x + dx, y + dy
-            if not (0 <= gx < self.grid_width and 0 <= gy < self.grid_height):
-                if show_warning: messagebox.showwarning("Invalid Placement", "Cannot place shape here: Out of bounds.")
-                return False
-            
-            occupying_id = self.grid_state[gx][gy]
-            if occupying_id is not None and occupying_id != ignore_block_id:
-                if show_warning: messagebox.showwarning("Invalid Placement", "Cannot place shape here: Space is already occupied.")
-                return False
+        width, height = self.shape_definitions.get(shape_name, (0, 0))
+        if not width or not height: return True
+        ignore_ids = NO_IGNORED_IDS if ignore_block_id is None else np.array([ignore_block_id], dtype=np.int32)
+        status = footprint_status(self.grid_state, x, y, width, height, ignore_ids)
+        if status == FOOTPRINT_OUT_OF_BOUNDS:
+            if show_warning: messagebox.showwarning("Invalid Placement", "Cannot place shape here: Out of bounds.")
+            return False
+        if status == FOOTPRINT_OCCUPIED:
+            if show_warning: messagebox.showwarning("Invalid Placement", "Cannot place shape here: Space is already occupied.")
+            return False
         return True
 
     # --- File Operations ---
     def save_to_file(self):
-        """Saves the current placement to a JSON file."""
-        filename = os.path.join(self.result_dir, f"{self.design_name}_placement.json")
+        """Saves the current placement as a table of blocks in a compressed NumPy file."""
+        filename = os.path.join(self.result_dir, f"{self.design_name}_placement.npz")
         if os.path.exists(filename) and not messagebox.askyesno("Overwrite?", f"File '{filename}' exists. Overwrite?"):
             return
         
-        with open(filename, "w") as f:
-            json.dump({id(b): b.data for b in self.block_objects.values()}, f, indent=4)
+        blocks = list(self.block_objects.values())
+        name_len = max((len(b.cell_name) for b in blocks), default=1)
+        table = np.array(
+            [(b.cell_name, b.x, b.y, b.orientation) for b in blocks],
+            dtype=[('name', f'U{name_len}'), ('x', 'i4'), ('y', 'i4'), ('orientation', 'U4')]
+        )
+        np.savez_compressed(filename, blocks=table)
         messagebox.showinfo("Save Successful", f"Placement saved to {filename}")
         self._save_grid_txt()
 
     def _save_grid_txt(self):
         """Saves a text representation of the grid."""
         filename = os.path.join(self.result_dir, f"{self.design_name}_grid.txt")
+        # Slot 0 holds the EMPTY text, so handle h maps to slot h + 1
+        labels = np.empty(self._next_handle + 1, dtype=object)
+        labels[0] = "None"
+        for handle, block in self.block_objects.items():
+            labels[handle + 1] = f"{block.cell_name}({handle})({block.orientation})"
+        # One text row per y, listing the cells along x
+        cell_text = labels[self.grid_state.T + 1]
+        text = "".join([" , ".join(row) + '\n' for row in cell_text.tolist()])
         with open(filename, "w") as f:
-            for y in range(self.grid_height):
-                row = []
-                for x in range(self.grid_width):
-                    block_id = self.grid_state[x][y]
-                    if block_id:
-                        block = self.block_objects[block_id]
-                        row.append(f"{block.data['cell_name']}({id(block)})({block.data['orientation']})")
-                    else:
-                        row.append("None")
-                f.write(" , ".join(row) + '\n')
+            f.write(text)
 
     def load_from_file(self, default):
-        """Loads a placement from a JSON file."""
+        """Loads a placement from a .npz file, or from a legacy JSON placement file."""
         if default:
-            filename = os.path.join(self.result_dir, f"{self.design_name}_placement.json")
+            filename = os.path.join(self.result_dir, f"{self.design_name}_placement.npz")
+            legacy_filename = os.path.join(self.result_dir, f"{self.design_name}_placement.json")
+            if not os.path.exists(filename) and os.path.exists(legacy_filename):
+                filename = legacy_filename
         else:
-            filename = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+            filename = filedialog.askopenfilename(filetypes=[("Placement files", "*.npz *.json")])
 
         if not filename or not os.path.exists(filename):
             if default:
@@ -616,66 +847,73 @@ class BlockPlacement(tk.Tk):
             return
 
         try:
-            with open(filename, "r") as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError) as e:
+            records = self._read_placement(filename)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
             messagebox.showerror("Load Error", f"Failed to load file {filename}: {e}")
             return
         
-        self.clear_fp(confirm=False)
-        for block_data in data.values():
-            name = block_data['cell_name']
+        # Reset without drawing; the canvas is redrawn once after all blocks are restored
+        self._reset_blocks()
+        for name, x, y, orientation in records:
             if name not in self.shape_definitions:
                 log.logger.warning(f"Skipping unknown block type '{name}' from placement file.")
                 continue
-            block = BlockObject(name, block_data['x'], block_data['y'], self.shape_definitions[name], block_data['orientation'])
-            self.block_objects[id(block)] = block
+            self._add_block(BlockObject(name, x, y, self.shape_definitions[name], orientation))
         
         self.draw()
         messagebox.showinfo("Load Successful", f"Loaded {len(self.block_objects)} blocks.")
 
+    @staticmethod
+    def _read_placement(filename):
+        """Returns (cell_name, x, y, orientation) records from a .npz or legacy JSON placement file."""
+        if filename.endswith('.npz'):
+            with np.load(filename) as data:
+                table = data['blocks']
+                return list(zip(table['name'].tolist(), table['x'].tolist(), table['y'].tolist(), table['orientation'].tolist()))
+        with open(filename, "r") as f:
+            data = json.load(f)
+        return [(b['cell_name'], b['x'], b['y'], b['orientation']) for b in data.values()]
+
     def clear_fp(self, confirm=True):
         """Clears the entire floorplan."""
         if confirm and not messagebox.askyesno("Confirm Clear", "Clear the entire floorplan?"):
             return
+        self._reset_blocks()
+        self.draw()
+
+    def _reset_blocks(self):
+        """Removes all blocks, selections and guidelines without redrawing."""
+        for block in self.block_objects.values():
+            self._erase_block(block)
         self.block_objects.clear()
         self.selected_blocks.clear()
+        self._refresh_selected_handles()
         self.guideline_block_ids.clear()
-        self.draw()
 
     # --- Advanced Actions (Bound to keys) ---
-    def can_move(self, x_offset, y_offset):
-        temp_grid_state = deepcopy(self.grid_state)
-        selected_ids = {id(block) for block in self.selected_blocks}
-
-        # Temporarily remove selected blocks from the grid for collision checking
-        for x in range(self.grid_width):
-            for y in range(self.grid_height):
-                if temp_grid_state[x][y] in selected_ids:
-                    temp_grid_state[x][y] = None
-
+    def _move_blocker(self, x_offset, y_offset):
+        """Returns the MoveBlocker preventing the selected blocks from shifting by the offset, or None. No UI."""
+        grid_state = self.grid_state
+        # Cells of selected blocks are ignored so they don't collide with themselves
+        ignore_ids = self._selected_handles
         for block in self.selected_blocks:
-            new_x, new_y = block.data['x'] + x_offset, block.data['y'] + y_offset
-            for dx, dy in block.block_shape:
-                gx, gy = new_x + dx, new_y + dy
-                if not (0 <= gx < self.grid_width and 0 <= gy < self.grid_height):
-                    messagebox.showwarning("Move Warning", "Cannot move: out of boundaries!")
-                    return False
-                if temp_grid_state[gx][gy] is not None:
-                    messagebox.showwarning("Move Warning", "Cannot move: position is occupied!")
-                    return False
-        return True
+            status = footprint_status(grid_state, block.x + x_offset, block.y + y_offset, block.block_width, block.block_height, ignore_ids)
+            if status != FOOTPRINT_FREE:
+                return MOVE_BLOCKERS[status]
+        return None
 
     def move(self, x_offset, y_offset):
         if not self.selected_blocks:
             messagebox.showwarning("Move Warning", "No block selected.")
             return False
 
-        if not self.can_move(x_offset, y_offset):
+        blocker = self._move_blocker(x_offset, y_offset)
+        if blocker is not None:
+            messagebox.showwarning("Move Warning", f"Cannot move: {blocker.value}!")
             return False
 
         for block in self.selected_blocks:
-            block.update_location(block.data['x'] + x_offset, block.data['y'] + y_offset)
+            block.update_location(block.x + x_offset, block.y + y_offset)
         
         self.draw()
         return True
@@ -694,27 +932,31 @@ class BlockPlacement(tk.Tk):
         interval = simpledialog.askinteger("Input", "Enter the expected interval:", parent=self, minvalue=0)
         if direction is None or interval is None: return
 
-        for block in list(self.selected_blocks.keys()):
-            start_x, start_y = block.data['x'], block.data['y']
-            block_width = block.urx_in_canvas - block.llx_in_canvas + 1
-            block_height = block.ury_in_canvas - block.lly_in_canvas + 1
+        for block in list(self.selected_blocks):
+            start_x, start_y = block.x, block.y
+            block_width, block_height = block.block_width, block.block_height
 
             if direction == "V":
-                for i in range(1, self.grid_height):
-                    new_y = start_y + i * (interval + block_height)
-                    if new_y >= self.grid_height: break
-                    if self._is_location_legal(start_x, new_y, block.data['cell_name']):
-                        new_block = BlockObject(block.data['cell_name'], start_x, new_y, block.block_shape, 'R0')
-                        self.block_objects[id(new_block)] = new_block
+                # Blocks sticking out of the grid across the band have no band to scan
+                if start_x < 0 or start_x + block_width > self.grid_width: continue
+                band = (self.grid_state[start_x:start_x + block_width, :] != EMPTY).any(axis=0)
+                for new_y in self._free_repeat_positions(band, start_y, interval + block_height, block_height):
+                    self._add_block(BlockObject(block.cell_name, start_x, new_y, (block_width, block_height), 'R0'))
             elif direction == "H":
-                for i in range(1, self.grid_width):
-                    new_x = start_x + i * (interval + block_width)
-                    if new_x >= self.grid_width: break
-                    if self._is_location_legal(new_x, start_y, block.data['cell_name']):
-                        new_block = BlockObject(block.data['cell_name'], new_x, start_y, block.block_shape, 'R0')
-                        self.block_objects[id(new_block)] = new_block
+                if start_y < 0 or start_y + block_height > self.grid_height: continue
+                band = (self.grid_state[:, start_y:start_y + block_height] != EMPTY).any(axis=1)
+                for new_x in self._free_repeat_positions(band, start_x, interval + block_width, block_width):
+                    self._add_block(BlockObject(block.cell_name, new_x, start_y, (block_width, block_height), 'R0'))
         self.draw()
 
+    @staticmethod
+    def _free_repeat_positions(band_occupied, start, stride, length):
+        """Returns the positions start + i * stride (i >= 1) where a block of the given length fits on free band entries."""
+        candidates = np.arange(start + stride, len(band_occupied) - length + 1, stride)
+        candidates = candidates[candidates >= 0]  # start may lie outside the grid
+        prefix = np.concatenate(([0], np.cumsum(band_occupied)))
+        return candidates[prefix[candidates + length] == prefix[candidates]].tolist()
+
     def swap_selected(self, event=None):
         if len(self.selected_blocks) != 1 or not self.selected_shape:
             messagebox.showwarning("Swap Warning", "Select exactly one block to swap and a target shape from the list.")
@@ -722,31 +964,18 @@ class BlockPlacement(tk.Tk):
         
         block = next(iter(self.selected_blocks))
         
-        if self.shape_definitions[block.data['cell_name']] == self.shape_definitions[self.selected_shape]:
-            block.data['cell_name'] = self.selected_shape
+        if (block.block_width, block.block_height) == self.shape_definitions[self.selected_shape]:
+            block.cell_name = self.selected_shape
         else:
             messagebox.showwarning("Swap Warning", f"Cannot swap blocks with different dimensions ('{self.selected_shape}').")
             return
         self.draw()
 
-    def can_move_to(self, block, target_x, target_y):
-        # Temporarily remove the block to check for collisions with others
-        temp_grid_state = deepcopy(self.grid_state)
-        for dx, dy in block.block_shape:
-            gx, gy = block.data['x'] + dx, block.data['y'] + dy
-            if 0 <= gx < self.grid_width and 0 <= gy < self.grid_height:
-                if temp_grid_state[gx][gy] == id(block):
-                    temp_grid_state[gx][gy] = None
-
-        for dx, dy in block.block_shape:
-            new_x, new_y = target_x + dx, target_y + dy
-            if not (0 <= new_x < self.grid_width and 0 <= new_y < self.grid_height):
-                messagebox.showwarning("Move Warning", "Cannot move to this location: out of boundaries!")
-                return False
-            if temp_grid_state[new_x][new_y] is not None:
-                messagebox.showwarning("Move Warning", "Cannot move to this location: position is occupied!")
-                return False
-        return True
+    def _move_to_blocker(self, block, target_x, target_y):
+        """Returns the MoveBlocker preventing a block from moving to the target cell, or None. No UI."""
+        # The block's own cells are ignored so it can move onto its current footprint
+        ignore_ids = np.array([block.handle], dtype=np.int32)
+        return MOVE_BLOCKERS.get(footprint_status(self.grid_state, target_x, target_y, block.block_width, block.block_height, ignore_ids))
 
     def move_to_coord(self, event=None):
         if len(self.selected_blocks) != 1:
@@ -756,19 +985,28 @@ class BlockPlacement(tk.Tk):
         coord_str = simpledialog.askstring("Move To", "Enter target coordinate (e.g., A42):")
         if not coord_str: return
         
-        match = re.match(r"([A-Za-z]+)([0-9]+)", coord_str)
-        if not match:
+        coord_str = coord_str.strip().upper()
+        split = 0
+        while split < len(coord_str) and 'A' <= coord_str[split] <= 'Z':
+            split += 1
+        col_str, row_str = coord_str[:split], coord_str[split:]
+        if not col_str or not (row_str.isascii() and row_str.isdigit()):
             messagebox.showwarning("Input Error", "Invalid coordinate format. Use Excel-style (e.g., A1, B22, AA5).")
             return
 
-        col_str, row_str = match.groups()
-        col = sum((ord(char) - ord('A') + 1) * (26 ** i) for i, char in enumerate(reversed(col_str.upper()))) - 1
+        col = 0
+        for char in col_str:
+            col = col * 26 + ord(char) - ord('A') + 1
+        col -= 1
         row = int(row_str) - 1
         
         block = next(iter(self.selected_blocks))
-        if self.can_move_to(block, col, row):
-            block.update_location(col, row)
-            self.draw()
+        blocker = self._move_to_blocker(block, col, row)
+        if blocker is not None:
+            messagebox.showwarning("Move Warning", f"Cannot move to this location: {blocker.value}!")
+            return
+        block.update_location(col, row)
+        self.draw()
 
 if __name__ == "__main__":
     args = read_args()